@@ -0,0 +1,131 @@
+import os
+import sys
+import queue
+import struct
+import threading
+import zlib
+import pygame
+from settings import CAPTURE_QUEUE_SIZE, CAPTURE_WORKERS
+
+def write_png(path, data, width, height):
+    """Write raw RGB bytes to a PNG file."""
+    stride = width * 3
+    # Each scanline starts with a filter type byte (0 = none)
+    rows = b"".join(
+        b"\x00" + data[y * stride:(y + 1) * stride] for y in range(height)
+    )
+
+    def chunk(kind, payload):
+        body = kind + payload
+        return struct.pack(">I", len(payload)) + body + struct.pack(">I", zlib.crc32(body))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(rows, 6)))
+        f.write(chunk(b"IEND", b""))
+
+def open_stdout_stream():
+    """
+    Take over stdout for binary frame data.
+
+    Returns a stream on a copy of the original stdout and points stdout (both
+    sys.stdout and file descriptor 1, so child processes too) at stderr, so
+    later prints cannot end up between frames.
+    """
+    sys.stdout.flush()
+    stream = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return stream
+
+class FrameWriter:
+    """
+    Writes captured frames from background threads.
+
+    submit() copies the frame's pixels and hands them to worker threads
+    through a bounded queue. When the queue is full the frame is dropped
+    (or, with block=True, the caller waits), so a slow disk never stalls the
+    game loop. In "png" mode frames are numbered PNG files in a directory;
+    in "raw" mode RGB24 frames are appended in order to one file, or to
+    stdout with "-", for piping into a video encoder.
+    """
+    def __init__(self, path, mode="png", workers=CAPTURE_WORKERS, queue_size=CAPTURE_QUEUE_SIZE):
+        self.path = path
+        self.mode = mode
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.frame_index = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.failed = False
+        self.lock = threading.Lock()
+
+        if mode == "png":
+            os.makedirs(path, exist_ok=True)
+            self.output = None
+        elif mode == "raw":
+            # A single stream must be written in order, so use one worker
+            workers = 1
+            self.output = open_stdout_stream() if path == "-" else open(path, "wb")
+        else:
+            raise ValueError(f"Unknown capture mode: {mode}")
+
+        self.threads = []
+        for _ in range(max(1, workers)):
+            thread = threading.Thread(target=self.work, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, surface, block=False):
+        """Queue a copy of a surface's pixels; returns False if it was dropped."""
+        data = pygame.image.tobytes(surface, "RGB")
+        item = (self.frame_index, data, surface.get_width(), surface.get_height())
+        try:
+            self.queue.put(item, block=block)
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+        self.frame_index += 1
+        return True
+
+    def work(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            index, data, width, height = item
+            if self.failed:
+                # The stream is gone (e.g. the encoder exited); keep draining
+                continue
+            try:
+                if self.mode == "png":
+                    write_png(os.path.join(self.path, f"frame_{index:06d}.png"), data, width, height)
+                else:
+                    self.output.write(data)
+                with self.lock:
+                    self.frames_written += 1
+            except OSError as e:
+                print(f"Unable to write frame {index}")
+                print(e)
+                if self.mode == "raw":
+                    self.failed = True
+
+    def close(self):
+        """Finish writing all queued frames and stop the workers."""
+        for _ in self.threads:
+            # A worker that died can leave the queue full, so never wait on
+            # it once no worker is left to empty it
+            while any(thread.is_alive() for thread in self.threads):
+                try:
+                    self.queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+        for thread in self.threads:
+            thread.join()
+        if self.output is not None:
+            try:
+                self.output.close()
+            except OSError as e:
+                print("Unable to finish writing frames")
+                print(e)
@@ -1,17 +1,15 @@
+import math
 from settings import (
     STATE_MENU, STATE_PLAYING, STATE_SUCCESS, STATE_FAILURE, STATE_PAUSED,
-    SCREEN_WIDTH, SCREEN_HEIGHT
+    STATE_REWIND, SCREEN_WIDTH, SCREEN_HEIGHT, DRIFT_MARGIN, GRAVITY,
+    TIME_WARP_LEVELS, TIME_WARP_SAFE_DISTANCE
 )
 from rocket import Rocket
 from iss import ISS
 from ui import UI
-from physics import (
-    calculate_distance, check_collision, calculate_approach_speed,
-    check_docking_alignment
-)
-from settings import (
-    MAX_DOCKING_SPEED, DOCKING_ALIGNMENT_THRESHOLD, DOCKING_DISTANCE_THRESHOLD
-)
+from rewind import RewindBuffer
+from physics import FlightMetrics, coast
+from settings import MAX_DOCKING_SPEED, DOCKING_DISTANCE_THRESHOLD
 
 class GameState:
     def __init__(self):
@@ -26,6 +24,17 @@ class GameState:
         self.crashed = False
         self.drifted_away = False
         
+        # Distance and approach values shared by the rules, HUD and audio
+        self.metrics = FlightMetrics()
+        self.metrics.update(self.rocket, self.iss)
+        
+        # Time warp: index into TIME_WARP_LEVELS
+        self.time_warp_index = 0
+        
+        # Recent history for rewinding
+        self.rewind = RewindBuffer()
+        self.rewind_tick = 0
+        
         # Sound effects will be loaded in main.py
         self.sounds = {}
         
@@ -34,36 +43,120 @@ class GameState:
             # Update game objects
             self.rocket.update()
             self.iss.update()
+            self.metrics.update(self.rocket, self.iss)
             
             # Check win/lose conditions
             self.check_docking()
             self.check_failure_conditions()
+            
+            # Record this tick for rewinding
+            self.rewind.record(self.save_snapshot())
     
-    def check_docking(self):
-        # Calculate distance between rocket and ISS docking port
-        distance = calculate_distance(
-            self.rocket, 
-            type('obj', (), {'x': self.iss.docking_port_x, 'y': self.iss.docking_port_y})
-        )
+    def update_frame(self):
+        """
+        Run one rendered frame worth of simulation ticks.
         
-        # Check if close enough to dock
-        if distance < DOCKING_DISTANCE_THRESHOLD:
-            # Check approach speed
-            approach_speed = calculate_approach_speed(self.rocket, self.iss)
+        With time warp active this is several ticks. Ticks where no controls
+        are held are coasted in batches, but only up to get_safe_coast_ticks,
+        so docking and failure checks still happen on the exact tick.
+        """
+        remaining = self.get_time_warp()
+        while remaining > 0 and self.current_state == STATE_PLAYING:
+            # Drop back to normal speed near the ISS, finishing with one normal tick
+            if self.time_warp_index and self.metrics.distance < TIME_WARP_SAFE_DISTANCE:
+                self.time_warp_index = 0
+                remaining = 1
             
-            # Check alignment
-            aligned = check_docking_alignment(
-                self.rocket, self.iss, DOCKING_ALIGNMENT_THRESHOLD
-            )
+            if remaining > 1 and self.rocket.get_control_flags() == 0:
+                ticks = min(remaining, self.get_safe_coast_ticks())
+                if ticks > 1:
+                    self.coast(ticks)
+                    remaining -= ticks
+                    continue
             
+            self.update()
+            remaining -= 1
+    
+    def get_safe_coast_ticks(self):
+        """
+        Number of coasting ticks that cannot trigger docking or failure.
+        
+        Over k ticks the rocket moves at most k * (speed + k * GRAVITY) and the
+        ISS at most k * its maximum orbital speed, so k is the largest value for
+        which that cannot close any of the distances the rules check.
+        """
+        rocket = self.rocket
+        metrics = self.metrics
+        
+        # Closest the rocket is to any docking or failure boundary
+        approach_margin = min(
+            metrics.port_distance - DOCKING_DISTANCE_THRESHOLD,
+            metrics.distance - (rocket.collision_radius + self.iss.collision_radius)
+        )
+        drift_margin = min(
+            rocket.x + DRIFT_MARGIN, SCREEN_WIDTH + DRIFT_MARGIN - rocket.x,
+            rocket.y + DRIFT_MARGIN, SCREEN_HEIGHT + DRIFT_MARGIN - rocket.y
+        )
+        
+        # Solve GRAVITY * k^2 + speed * k < margin for each case
+        speed = metrics.velocity
+        iss_speed = self.iss.max_speed
+        ticks = min(
+            self.max_ticks_within(approach_margin, speed + iss_speed),
+            self.max_ticks_within(drift_margin, speed)
+        )
+        return max(0, ticks - 1)
+    
+    def max_ticks_within(self, margin, speed):
+        if margin <= 0:
+            return 0
+        return int((-speed + math.sqrt(speed**2 + 4 * GRAVITY * margin)) / (2 * GRAVITY))
+    
+    def coast(self, ticks):
+        """Advance several ticks with no controls held."""
+        # Record every tick but the last for rewinding; angle, fuel and
+        # flags cannot change while coasting
+        rocket = self.rocket
+        start_time = self.iss.time
+        flags = self.save_snapshot()[7]
+        record = self.rewind.record
+        
+        def record_tick(tick, x, y, velocity_x, velocity_y):
+            if tick < ticks - 1:
+                record((x, y, rocket.angle, velocity_x, velocity_y, rocket.fuel,
+                        start_time + tick + 1, flags))
+        
+        coast(rocket, ticks, record_tick)
+        self.iss.set_time(start_time + ticks)
+        self.metrics.update(self.rocket, self.iss)
+        
+        # Nothing can trigger in a safe coast, but check the final tick anyway
+        self.check_docking()
+        self.check_failure_conditions()
+        
+        # The last tick is recorded after the checks, as in update()
+        self.rewind.record(self.save_snapshot())
+    
+    def get_time_warp(self):
+        return TIME_WARP_LEVELS[self.time_warp_index]
+    
+    def change_time_warp(self, step):
+        """Step the time warp level up (positive) or down (negative)."""
+        self.time_warp_index = max(0, min(len(TIME_WARP_LEVELS) - 1, self.time_warp_index + step))
+    
+    def check_docking(self):
+        metrics = self.metrics
+        
+        # Check if close enough to dock
+        if metrics.port_distance < DOCKING_DISTANCE_THRESHOLD:
             # Successful docking conditions
-            if abs(approach_speed) < MAX_DOCKING_SPEED and aligned:
+            if metrics.approach_speed < MAX_DOCKING_SPEED and metrics.aligned:
                 self.docking_successful = True
                 self.current_state = STATE_SUCCESS
                 if 'dock_success' in self.sounds:
                     self.sounds['dock_success'].play()
             # Crash condition - too fast
-            elif abs(approach_speed) >= MAX_DOCKING_SPEED:
+            elif metrics.approach_speed >= MAX_DOCKING_SPEED:
                 self.crashed = True
                 self.current_state = STATE_FAILURE
                 if 'crash' in self.sounds:
@@ -76,23 +169,25 @@ class GameState:
             self.current_state = STATE_FAILURE
         
         # Check if rocket has drifted too far away
-        if (self.rocket.x < -200 or self.rocket.x > SCREEN_WIDTH + 200 or 
-            self.rocket.y < -200 or self.rocket.y > SCREEN_HEIGHT + 200):
+        if (self.rocket.x < -DRIFT_MARGIN or self.rocket.x > SCREEN_WIDTH + DRIFT_MARGIN or 
+            self.rocket.y < -DRIFT_MARGIN or self.rocket.y > SCREEN_HEIGHT + DRIFT_MARGIN):
             self.drifted_away = True
             self.current_state = STATE_FAILURE
         
         # Check for collision with ISS (outside of docking port)
-        if check_collision(self.rocket, self.iss, self.rocket.collision_radius + self.iss.collision_radius):
+        if self.metrics.colliding:
             # If we're not near the docking port, it's a crash
-            if not check_docking_alignment(self.rocket, self.iss, DOCKING_ALIGNMENT_THRESHOLD * 2):
+            if not self.metrics.loosely_aligned:
                 self.crashed = True
                 self.current_state = STATE_FAILURE
                 if 'crash' in self.sounds:
                     self.sounds['crash'].play()
     
     def reset_game(self):
-        # Reset the rocket
+        # Reset the rocket and put the ISS back at the start of its orbit
         self.rocket.reset(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100)
+        self.iss.set_time(0)
+        self.metrics.update(self.rocket, self.iss)
         
         # Reset game status
         self.current_state = STATE_PLAYING
@@ -100,6 +195,58 @@ class GameState:
         self.out_of_fuel = False
         self.crashed = False
         self.drifted_away = False
+        self.time_warp_index = 0
+        self.rewind.clear()
+    
+    def save_snapshot(self):
+        """
+        Capture the rocket and outcome state as a flat tuple.
+        
+        The tuple is (x, y, angle, vx, vy, fuel, iss_time, flags) where flags packs the
+        rocket controls (bits 0-3), outcome flags (bits 4-7) and the current
+        state (bits 8+). It is cheap enough to take every tick and can be used
+        for branching rollouts instead of copy.deepcopy.
+        """
+        flags = (
+            self.rocket.get_control_flags() |
+            (16 if self.docking_successful else 0) |
+            (32 if self.out_of_fuel else 0) |
+            (64 if self.crashed else 0) |
+            (128 if self.drifted_away else 0) |
+            (self.current_state << 8)
+        )
+        return self.rocket.get_state() + (self.iss.time, flags)
+    
+    def restore_snapshot(self, snapshot):
+        """Restore a snapshot taken with save_snapshot."""
+        self.rocket.set_state(*snapshot[:6])
+        self.iss.set_time(round(snapshot[6]))
+        flags = snapshot[7]
+        self.rocket.set_control_flags(flags)
+        self.docking_successful = bool(flags & 16)
+        self.out_of_fuel = bool(flags & 32)
+        self.crashed = bool(flags & 64)
+        self.drifted_away = bool(flags & 128)
+        self.current_state = flags >> 8
+        self.metrics.update(self.rocket, self.iss)
+    
+    def start_rewind(self):
+        """Pause the simulation and start scrubbing from the latest tick."""
+        if len(self.rewind) == 0:
+            return
+        self.rewind_tick = self.rewind.end - 1
+        self.current_state = STATE_REWIND
+    
+    def scrub_rewind(self, steps):
+        """Move the rewind cursor by a number of ticks (negative goes back)."""
+        self.rewind_tick = max(self.rewind.start, min(self.rewind.end - 1, self.rewind_tick + steps))
+        self.restore_snapshot(self.rewind.get(self.rewind_tick))
+        self.current_state = STATE_REWIND
+    
+    def resume_from_rewind(self):
+        """Continue the simulation from the tick under the rewind cursor."""
+        self.rewind.truncate(self.rewind_tick)
+        self.restore_snapshot(self.rewind.get(self.rewind_tick))
     
     def get_failure_message(self):
         if self.out_of_fuel:
@@ -0,0 +1,55 @@
+from collections import deque
+from settings import (
+    FPS, QUALITY_TIERS, QUALITY_WINDOW, QUALITY_COOLDOWN,
+    QUALITY_DOWN_THRESHOLD, QUALITY_UP_THRESHOLD
+)
+
+class QualityGovernor:
+    """
+    Steps the detail level down when frames miss the FPS budget and back up
+    when there is headroom again.
+
+    Decisions are made on the average work time (excluding the frame-rate
+    wait) over QUALITY_WINDOW frames. Stepping down and stepping up use
+    different thresholds and every change is followed by a cooldown, so the
+    tier does not flap between two levels. Tier 0 is full quality.
+    """
+    def __init__(self, budget_ms=1000 / FPS, tiers=QUALITY_TIERS):
+        self.budget_ms = budget_ms
+        self.tiers = tiers
+        self.tier = 0
+        self.samples = deque(maxlen=QUALITY_WINDOW)
+        self.cooldown = 0
+        self.frame = 0
+
+        # Recent decisions as (frame, old tier, new tier, average ms)
+        self.decisions = deque(maxlen=50)
+
+    def get_settings(self):
+        """Detail settings for the current tier."""
+        return self.tiers[self.tier]
+
+    def record(self, work_ms):
+        """Add one frame's work time; returns True if the tier changed."""
+        self.frame += 1
+        self.samples.append(work_ms)
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return False
+        if len(self.samples) < self.samples.maxlen:
+            return False
+
+        average = sum(self.samples) / len(self.samples)
+        if average > self.budget_ms * QUALITY_DOWN_THRESHOLD and self.tier < len(self.tiers) - 1:
+            self.set_tier(self.tier + 1, average)
+            return True
+        if average < self.budget_ms * QUALITY_UP_THRESHOLD and self.tier > 0:
+            self.set_tier(self.tier - 1, average)
+            return True
+        return False
+
+    def set_tier(self, tier, average=0.0):
+        self.decisions.append((self.frame, self.tier, tier, average))
+        self.tier = tier
+        self.samples.clear()
+        self.cooldown = QUALITY_COOLDOWN
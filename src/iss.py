@@ -1,9 +1,16 @@
 import pygame
-from settings import ISS_X, ISS_Y, DOCKING_PORT_OFFSET_X, DOCKING_PORT_OFFSET_Y
+from settings import (
+    ISS_X, ISS_Y, DOCKING_PORT_OFFSET_X, DOCKING_PORT_OFFSET_Y, FPS,
+    ISS_ORBIT_SEMI_MAJOR, ISS_ORBIT_ECCENTRICITY, ISS_ORBIT_INCLINATION,
+    ISS_ORBIT_PERIOD, ISS_EPHEMERIS_SAMPLES
+)
+from orbit import Ephemeris
+from utils import convert_image
 
 class ISS:
     def __init__(self):
-        self.original_image = pygame.image.load("assets/images/iss.png").convert_alpha()
+        # Not converted when running without a display (simulation process)
+        self.original_image = convert_image(pygame.image.load("assets/images/iss.png"))
         self.image = self.original_image
         self.rect = self.image.get_rect()
         
@@ -21,23 +28,60 @@ class ISS:
         self.height = self.rect.height
         self.collision_radius = max(self.width, self.height) / 2
         
-        # ISS has zero velocity (stationary in this game)
+        # Velocity in pixels per tick, same units as the rocket
         self.velocity_x = 0
         self.velocity_y = 0
+        
+        # Orbit, looked up from a precomputed table instead of integrated
+        self.ephemeris = None
+        if ISS_ORBIT_SEMI_MAJOR > 0:
+            self.ephemeris = Ephemeris(
+                ISS_ORBIT_SEMI_MAJOR, ISS_ORBIT_ECCENTRICITY, ISS_ORBIT_INCLINATION,
+                ISS_ORBIT_PERIOD * FPS, ISS_EPHEMERIS_SAMPLES
+            )
+        self.max_speed = self.ephemeris.max_speed if self.ephemeris else 0
+        self.time = 0  # Ticks since the start of the orbit
+        self.set_time(0)
     
     def update(self):
-        # ISS is stationary in this version of the game
-        pass
+        # Advance one tick along the orbit
+        self.set_time(self.time + 1)
+    
+    def set_time(self, time):
+        """Move the ISS to its orbital position at a time in ticks."""
+        self.time = time
+        if self.ephemeris is None:
+            return
+        
+        offset_x, offset_y, self.velocity_x, self.velocity_y = self.ephemeris.state_at(time)
+        self.x = ISS_X + offset_x
+        self.y = ISS_Y + offset_y
+        self.rect.center = (self.x, self.y)
+        self.docking_port_x = self.x + DOCKING_PORT_OFFSET_X
+        self.docking_port_y = self.y + DOCKING_PORT_OFFSET_Y
+    
+    def get_docking_port_at(self, time):
+        """Get the docking port position at any time in ticks."""
+        if self.ephemeris is None:
+            return self.docking_port_x, self.docking_port_y
+        offset_x, offset_y, _, _ = self.ephemeris.state_at(time)
+        return (
+            ISS_X + offset_x + DOCKING_PORT_OFFSET_X,
+            ISS_Y + offset_y + DOCKING_PORT_OFFSET_Y
+        )
     
     def draw(self, screen):
         # Draw the ISS
         screen.blit(self.image, self.rect)
         
         # Optional: Draw the docking port visually
+        self.draw_docking_port(screen, (int(self.docking_port_x), int(self.docking_port_y)))
+    
+    def draw_docking_port(self, screen, position):
         pygame.draw.circle(
             screen, 
             (255, 255, 0),  # Yellow
-            (int(self.docking_port_x), int(self.docking_port_y)), 
+            position, 
             5,  # Radius
             2   # Line thickness
         )
\ No newline at end of file
@@ -1,38 +1,70 @@
+import os
+# Keep pygame's import banner off stdout, which may be a raw capture stream
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
 import pygame
 import sys
-import os
+import time
+import random
+from collections import deque
 from settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS, BLACK, WHITE,
     STATE_MENU, STATE_PLAYING, STATE_SUCCESS, STATE_FAILURE, STATE_PAUSED,
+    STATE_REWIND, REWIND_SCRUB_SPEED,
     THRUST_SOUND, WARNING_SOUND, DOCK_SUCCESS_SOUND, CRASH_SOUND, SPACE_AMBIENCE_SOUND,
-    EARTH_POSITION, EARTH_RADIUS
+    EARTH_POSITION, EARTH_RADIUS, RENDERER, PROFILE_REPORT_INTERVAL, SHOW_TRAJECTORY,
+    CAPTURE_DIRECTORY, HIGHLIGHT_FRAMES_PER_TICK, QUALITY_TIERS, SPLIT_SIMULATION
 )
 from game_state import GameState
-from physics import calculate_distance
+from render import create_renderer, SurfaceRenderer
+from capture import FrameWriter
+from governor import QualityGovernor
+from simulation import SimulationProcess
+from profiler import FrameProfiler, TickJitter
+from trajectory import TrajectoryPredictor
 from utils import (
     load_image, load_sound, create_stars_background, 
     create_missing_directories, create_placeholder_assets
 )
 
 class Game:
-    def __init__(self):
+    def __init__(self, renderer=RENDERER, profile=False, capture=None, capture_mode="png",
+                 quality="auto", split_simulation=SPLIT_SIMULATION):
         # Initialize pygame
         pygame.init()
         pygame.mixer.init()
         
-        # Create screen
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Create screen and the renderer that draws to it
+        self.screen, self.renderer = create_renderer(renderer)
         pygame.display.set_caption(TITLE)
         
         # Set up clock
         self.clock = pygame.time.Clock()
         
+        # Frame timings, reported periodically when profiling is enabled
+        self.profile = profile
+        self.profiler = FrameProfiler()
+        self.tick_jitter = TickJitter()
+        
+        # Optional capture of every rendered frame
+        self.capture = FrameWriter(capture, capture_mode) if capture else None
+        
+        # Highlight clip being exported a few frames at a time
+        self.highlight_writer = None
+        self.highlight_renderer = None
+        self.highlight_snapshots = deque()
+        
         # Create necessary directories and placeholder assets
         create_missing_directories()
         create_placeholder_assets()
         
         # Load background images
-        self.stars_bg = create_stars_background(SCREEN_WIDTH, SCREEN_HEIGHT, 150)
+        self.earth_pos = (
+            EARTH_POSITION[0] - EARTH_RADIUS,
+            EARTH_POSITION[1] - EARTH_RADIUS
+        )
+        self.star_seed = random.random()  # Fixed per run so tiers share their stars
+        self.star_count = None
+        self.earth_baked = None
         try:
             self.earth_image = load_image("assets/images/earth.png")
         except:
@@ -43,6 +75,25 @@ class Game:
         # Initialize game state
         self.game_state = GameState()
         
+        # Predicted path overlay
+        self.show_trajectory = SHOW_TRAJECTORY
+        self.trajectory = TrajectoryPredictor()
+        
+        # Detail level, adjusted to hold the frame rate unless fixed
+        self.governor = QualityGovernor()
+        self.adaptive_quality = quality == "auto"
+        if not self.adaptive_quality:
+            self.governor.set_tier(int(quality))
+        self.apply_quality()
+        
+        # Optionally step the simulation in its own process; game_state is
+        # then a view of the state it publishes
+        self.simulation = SimulationProcess() if split_simulation else None
+        self.sent_controls = 0
+        self.pending_command = 0  # Last start/reset not yet seen by the simulation
+        self.simulation_tick = None  # Tick of the last frame applied to the view
+        self.simulation_jitter = (0.0, 0.0)
+        
         # Load sounds
         self.load_game_sounds()
         
@@ -63,7 +114,7 @@ class Game:
     def handle_events(self):
         for event in pygame.event.get():
             # Quit events
-            if event.type == pygame.QUIT:
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                 return False
             
             # Key press events
@@ -74,13 +125,41 @@ class Game:
                 # State-specific key handling
                 if self.game_state.current_state == STATE_MENU:
                     if event.key == pygame.K_SPACE:
-                        self.game_state.current_state = STATE_PLAYING
+                        self.start_mission()
                 
                 elif self.game_state.current_state in [STATE_SUCCESS, STATE_FAILURE]:
                     if event.key == pygame.K_SPACE:
-                        self.game_state.reset_game()
+                        self.restart_mission()
+                    elif event.key == pygame.K_r:
+                        self.game_state.start_rewind()
+                    elif event.key == pygame.K_h:
+                        self.export_highlight()
+                
+                elif self.game_state.current_state == STATE_REWIND:
+                    if event.key in (pygame.K_r, pygame.K_SPACE):
+                        self.game_state.resume_from_rewind()
+                        self.sync_controls()
                 
                 elif self.game_state.current_state == STATE_PLAYING:
+                    # Rewind
+                    if event.key == pygame.K_r:
+                        self.game_state.start_rewind()
+                        # Nothing is recorded to rewind in split simulation mode
+                        rewinding = self.game_state.current_state == STATE_REWIND
+                        if rewinding and 'thrust' in self.game_state.sounds:
+                            self.game_state.sounds['thrust'].stop()
+                    
+                    # Time warp
+                    if event.key == pygame.K_PERIOD:
+                        self.change_time_warp(1)
+                    if event.key == pygame.K_COMMA:
+                        self.change_time_warp(-1)
+                    
+                    # Toggle the predicted path overlay
+                    if event.key == pygame.K_t:
+                        self.show_trajectory = not self.show_trajectory
+                        self.trajectory.clear()
+                    
                     # Thruster controls
                     if event.key == pygame.K_UP:
                         self.game_state.rocket.is_thrusting = True
@@ -115,81 +194,331 @@ class Game:
         
         return True
     
+    def start_mission(self):
+        self.game_state.current_state = STATE_PLAYING
+        if self.simulation:
+            self.pending_command = self.simulation.send('start')
+    
+    def restart_mission(self):
+        self.game_state.reset_game()
+        if self.simulation:
+            self.pending_command = self.simulation.send('reset')
+    
+    def change_time_warp(self, step):
+        self.game_state.change_time_warp(step)
+        if self.simulation:
+            self.simulation.send('time_warp', step)
+    
+    def sync_controls(self):
+        # Match the rocket controls to the keys actually held down
+        keys = pygame.key.get_pressed()
+        rocket = self.game_state.rocket
+        rocket.is_thrusting = keys[pygame.K_UP]
+        rocket.is_rotating_left = keys[pygame.K_LEFT]
+        rocket.is_rotating_right = keys[pygame.K_RIGHT]
+        rocket.is_using_rcs = keys[pygame.K_SPACE]
+    
     def update(self):
-        # Update game state
-        self.game_state.update()
+        # Scrub through the rewind buffer while the arrow keys are held
+        if self.game_state.current_state == STATE_REWIND:
+            keys = pygame.key.get_pressed()
+            if keys[pygame.K_LEFT]:
+                self.game_state.scrub_rewind(-REWIND_SCRUB_SPEED)
+            elif keys[pygame.K_RIGHT]:
+                self.game_state.scrub_rewind(REWIND_SCRUB_SPEED)
+            return
+        
+        # Update game state (several ticks when time warp is active)
+        if self.simulation:
+            advanced = self.update_from_simulation()
+        else:
+            self.game_state.update_frame()
+            advanced = True
+        
+        # Keep the predicted path in step with the simulation
+        if advanced and self.show_trajectory and self.game_state.current_state == STATE_PLAYING:
+            self.trajectory.update(self.game_state.rocket, self.game_state.iss)
         
         # Play warnings if needed
-        if self.game_state.ui.speed_warning or self.game_state.ui.fuel_warning:
+        if self.game_state.metrics.speed_warning or self.game_state.metrics.fuel_warning:
             channel = pygame.mixer.find_channel()
             if 'warning' in self.game_state.sounds and channel and not channel.get_busy():
                 self.game_state.sounds['warning'].play()
     
-    def draw(self):
-        # Clear the screen
-        self.screen.fill(BLACK)
+    def apply_quality(self):
+        # Apply the governor's current detail settings
+        quality = self.governor.get_settings()
         
-        # Draw stars background
-        self.screen.blit(self.stars_bg, (0, 0))
+        # Rebuild the background if the star count or Earth baking changed
+        if quality['stars'] != self.star_count or quality['bake_earth'] != self.earth_baked:
+            self.stars_bg = create_stars_background(
+                SCREEN_WIDTH, SCREEN_HEIGHT, quality['stars'], self.star_seed
+            )
+            if quality['bake_earth']:
+                # Draw Earth into the background once instead of every frame
+                self.stars_bg.blit(self.earth_image, self.earth_pos)
+            self.star_count = quality['stars']
+            self.earth_baked = quality['bake_earth']
         
-        # Draw Earth
-        earth_pos = (
-            EARTH_POSITION[0] - EARTH_RADIUS,
-            EARTH_POSITION[1] - EARTH_RADIUS
-        )
-        self.screen.blit(self.earth_image, earth_pos)
+        self.renderer.hud_interval = quality['hud_interval']
+        self.game_state.rocket.set_rotation_step(quality['rotation_step'])
+        self.game_state.rocket.thruster_effects = quality['thruster']
+    
+    def update_from_simulation(self):
+        # Returns whether the view moved on to a new simulation tick
+        game_state = self.game_state
+        
+        # Forward control changes to the simulation process
+        controls = game_state.rocket.get_control_flags()
+        if controls != self.sent_controls:
+            self.simulation.send('controls', controls)
+            self.sent_controls = controls
+        
+        try:
+            frame = self.simulation.read()
+        except RuntimeError as e:
+            # Carry on from the last state shown, stepping it in this process
+            print("Simulation process stopped; continuing in a single process")
+            print(e)
+            self.simulation.stop()
+            self.simulation = None
+            game_state.update_frame()
+            return True
+        
+        # Keep the local view until the simulation has seen the last start/reset
+        if frame is None or frame.command_seq < self.pending_command:
+            return False
+        
+        # The render loop often runs again before the next tick is published
+        if frame.tick == self.simulation_tick:
+            return False
+        self.simulation_tick = frame.tick
+        
+        old_state = game_state.current_state
+        game_state.restore_snapshot(frame.snapshot)
+        # The published controls may predate the latest key presses
+        game_state.rocket.set_control_flags(controls)
+        game_state.time_warp_index = frame.time_warp_index
+        self.simulation_jitter = (frame.jitter_average, frame.jitter_max)
+        
+        # The simulation process has no audio, so play outcome sounds here
+        if game_state.current_state != old_state:
+            if game_state.current_state == STATE_SUCCESS and 'dock_success' in game_state.sounds:
+                game_state.sounds['dock_success'].play()
+            elif game_state.crashed and 'crash' in game_state.sounds:
+                game_state.sounds['crash'].play()
+        return True
+    
+    def get_tick_jitter(self):
+        # Ticks run once per frame unless the simulation has its own process
+        if self.simulation:
+            return self.simulation_jitter
+        return self.tick_jitter.average(), self.tick_jitter.maximum()
+    
+    def draw(self, renderer=None):
+        # Draw to the display unless another renderer (e.g. offscreen) is given
+        live = renderer is None
+        renderer = renderer or self.renderer
+        
+        # Draw stars background and Earth (unless it is baked into the stars)
+        earth_image = None if self.earth_baked else self.earth_image
+        renderer.draw_background(self.stars_bg, earth_image, self.earth_pos)
         
         # Draw game objects
         if self.game_state.current_state != STATE_MENU:
-            self.game_state.rocket.draw(self.screen)
-            self.game_state.iss.draw(self.screen)
+            renderer.draw_rocket(self.game_state.rocket)
+            renderer.draw_iss(self.game_state.iss)
+        
+        # Draw the predicted path (it only tracks the live simulation)
+        if live and self.show_trajectory and self.game_state.current_state == STATE_PLAYING:
+            renderer.draw_trajectory(self.trajectory.points, self.trajectory.closest_point)
+        
+        # Draw UI elements; the renderer may skip redrawing if nothing changed
+        renderer.draw_overlay(self.get_ui_key(live), lambda surface: self.draw_ui(surface, live))
+    
+    def export_highlight(self):
+        # Start replaying the rewind buffer offscreen as a PNG sequence
+        rewind = self.game_state.rewind
+        if len(rewind) == 0 or self.highlight_writer:
+            return
+        
+        # Copy the snapshots, as the buffer changes once the game goes on
+        self.highlight_snapshots = deque(rewind.get(tick) for tick in range(rewind.start, rewind.end))
+        path = os.path.join(CAPTURE_DIRECTORY, time.strftime("highlight_%Y%m%d_%H%M%S"))
+        self.highlight_writer = FrameWriter(path)
+        self.highlight_renderer = SurfaceRenderer(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)))
+    
+    def export_highlight_frames(self):
+        # Draw a few highlight frames per game frame so the game keeps running
+        writer = self.highlight_writer
+        current = self.game_state.save_snapshot()
+        drawn = 0
+        # Only draw frames the writer has room for, so none are dropped
+        while self.highlight_snapshots and drawn < HIGHLIGHT_FRAMES_PER_TICK and not writer.queue.full():
+            self.game_state.restore_snapshot(self.highlight_snapshots.popleft())
+            self.draw(self.highlight_renderer)
+            writer.submit(self.highlight_renderer.get_frame())
+            drawn += 1
+        self.game_state.restore_snapshot(current)
         
-        # Draw UI elements based on current state
+        if not self.highlight_snapshots and writer.queue.empty():
+            self.finish_highlight()
+    
+    def finish_highlight(self):
+        writer = self.highlight_writer
+        writer.close()
+        print(f"Saved {writer.frames_written} highlight frames to {writer.path}")
+        self.highlight_writer = None
+        self.highlight_renderer = None
+        self.highlight_snapshots.clear()
+    
+    def get_ui_key(self, live=True):
+        # Everything the UI layer shows; it only changes when this does
+        state = self.game_state.current_state
+        if state == STATE_MENU:
+            return (state,)
+        return (
+            state,
+            self.game_state.ui.get_hud_key(self.game_state.rocket, self.game_state.metrics),
+            self.game_state.rewind_tick if state == STATE_REWIND else None,
+            round(self.get_closest_approach(live) or 0, 1),
+            self.game_state.get_time_warp(),
+            self.simulation is None
+        )
+    
+    def get_closest_approach(self, live=True):
+        # Predicted closest approach, only shown while the overlay is active
+        # (the prediction tracks the live simulation, not replayed frames)
+        if live and self.show_trajectory and self.game_state.current_state == STATE_PLAYING:
+            return self.trajectory.closest_distance
+        return None
+    
+    def draw_ui(self, surface, live=True):
+        # Draw UI elements based on current state; returns the rects drawn to
+        ui = self.game_state.ui
         if self.game_state.current_state == STATE_MENU:
-            self.game_state.ui.draw_menu(self.screen)
+            return ui.draw_menu(surface)
         
         elif self.game_state.current_state == STATE_PLAYING:
-            # Calculate distance for UI
-            distance = calculate_distance(self.game_state.rocket, self.game_state.iss)
-            self.game_state.ui.draw_hud(self.screen, self.game_state.rocket, self.game_state.iss, distance)
+            return ui.draw_hud(
+                surface, self.game_state.rocket, self.game_state.metrics,
+                self.get_closest_approach(live), self.game_state.get_time_warp()
+            )
         
         elif self.game_state.current_state == STATE_SUCCESS:
-            distance = calculate_distance(self.game_state.rocket, self.game_state.iss)
-            self.game_state.ui.draw_hud(self.screen, self.game_state.rocket, self.game_state.iss, distance)
-            self.game_state.ui.draw_game_over(self.screen, True)
+            rects = ui.draw_hud(surface, self.game_state.rocket, self.game_state.metrics)
+            return rects + ui.draw_game_over(surface, True, self.simulation is None)
         
         elif self.game_state.current_state == STATE_FAILURE:
-            distance = calculate_distance(self.game_state.rocket, self.game_state.iss)
-            self.game_state.ui.draw_hud(self.screen, self.game_state.rocket, self.game_state.iss, distance)
-            self.game_state.ui.draw_game_over(self.screen, False)
+            rects = ui.draw_hud(surface, self.game_state.rocket, self.game_state.metrics)
+            rects += ui.draw_game_over(surface, False, self.simulation is None)
             # Draw specific failure message
             failure_message = self.game_state.get_failure_message()
-            self.game_state.ui.draw_warning(self.screen, failure_message)
+            return rects + ui.draw_warning(surface, failure_message)
         
-        # Update display
-        pygame.display.flip()
+        elif self.game_state.current_state == STATE_REWIND:
+            rects = ui.draw_hud(surface, self.game_state.rocket, self.game_state.metrics)
+            rewind = self.game_state.rewind
+            return rects + ui.draw_rewind_bar(
+                surface, self.game_state.rewind_tick - rewind.start, len(rewind)
+            )
+        return []
     
     def run(self):
         running = True
         
+        last_report = pygame.time.get_ticks()
+        
         while running:
+            self.profiler.begin_frame()
+            self.tick_jitter.record(self.profiler.frame_times[-1])
+            
             # Handle events
             running = self.handle_events()
+            self.profiler.mark('events')
             
             # Update game state
             self.update()
+            self.profiler.mark('update')
+            
+            # Continue any highlight export in progress; marked every frame,
+            # so the report shows 0ms rather than a stale average when idle
+            if self.highlight_writer:
+                self.export_highlight_frames()
+            self.profiler.mark('highlight')
             
             # Draw everything
             self.draw()
+            self.profiler.mark('draw')
+            
+            # Hand the frame to the capture threads
+            if self.capture:
+                self.capture.submit(self.renderer.get_frame())
+                self.profiler.mark('capture')
+            
+            # Update display
+            self.renderer.present()
+            self.profiler.mark('present')
+            
+            # Adjust the detail level based on how long this frame took
+            if self.adaptive_quality and self.governor.record(self.profiler.elapsed()):
+                self.apply_quality()
+                if self.profile:
+                    _, old_tier, new_tier, average = self.governor.decisions[-1]
+                    print(f"Quality tier {old_tier} -> {new_tier} (average work {average:.2f}ms)")
             
             # Maintain frame rate
             self.clock.tick(FPS)
+            self.profiler.mark('wait')
+            
+            if self.profile and pygame.time.get_ticks() - last_report >= PROFILE_REPORT_INTERVAL * 1000:
+                jitter_average, jitter_max = self.get_tick_jitter()
+                print(f"[{self.renderer.name} q{self.governor.tier}] {self.profiler.report()}  "
+                      f"tick jitter avg={jitter_average:.2f}ms max={jitter_max:.2f}ms")
+                last_report = pygame.time.get_ticks()
         
-        # Clean up and quit
+        # Clean up and quit; a highlight export in progress keeps the frames so far
+        if self.highlight_writer:
+            self.finish_highlight()
+        if self.simulation:
+            self.simulation.stop()
+        if self.capture:
+            self.capture.close()
+            print(f"Captured {self.capture.frames_written} frames "
+                  f"({self.capture.frames_dropped} dropped)")
         pygame.quit()
         sys.exit()
 
 # Entry point
 if __name__ == "__main__":
-    game = Game()
+    import argparse
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument(
+        "--renderer", choices=["surface", "sdl2"], default=RENDERER,
+        help="drawing backend (sdl2 falls back to software rendering without a GPU)"
+    )
+    parser.add_argument("--profile", action="store_true", help="print frame timings")
+    parser.add_argument(
+        "--capture", metavar="PATH",
+        help="save every frame (a directory for png, a file or - for raw)"
+    )
+    parser.add_argument(
+        "--capture-mode", choices=["png", "raw"], default="png",
+        help="png: numbered PNG files; raw: RGB24 frames for piping to an encoder"
+    )
+    parser.add_argument(
+        "--quality", choices=["auto"] + [str(tier) for tier in range(len(QUALITY_TIERS))],
+        default="auto", help="detail tier (0 = full) or auto to hold the frame rate"
+    )
+    parser.add_argument(
+        "--split-sim", action="store_true", default=SPLIT_SIMULATION,
+        help="step the simulation at a fixed rate in a separate process"
+    )
+    args = parser.parse_args()
+    
+    game = Game(
+        renderer=args.renderer, profile=args.profile,
+        capture=args.capture, capture_mode=args.capture_mode,
+        quality=args.quality, split_simulation=args.split_sim
+    )
     game.run()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import math
+
+def solve_kepler(mean_anomaly, eccentricity, iterations=8):
+    """Solve Kepler's equation M = E - e*sin(E) for the eccentric anomaly E."""
+    E = mean_anomaly if eccentricity < 0.8 else math.pi
+    for _ in range(iterations):
+        E -= (E - eccentricity * math.sin(E) - mean_anomaly) / (1 - eccentricity * math.cos(E))
+    return E
+
+class Ephemeris:
+    """
+    Precomputed table of positions and velocities along an elliptical orbit.
+
+    The orbit is a Keplerian ellipse around its center, seen at an inclination
+    so the vertical axis is foreshortened by cos(inclination). Positions are in
+    pixels relative to the orbit center and velocities in pixels per tick, so
+    they match the units used by Rocket. Kepler's equation is only solved while
+    building the table; state_at() interpolates between samples with cubic
+    Hermite splines, so looking up any time costs the same.
+    """
+    def __init__(self, semi_major, eccentricity, inclination, period, samples=360):
+        self.period = period
+        self.samples = samples
+        self.step = period / samples
+
+        semi_minor = semi_major * math.sqrt(1 - eccentricity**2)
+        vertical_scale = math.cos(math.radians(inclination))
+        mean_motion = 2 * math.pi / period
+
+        # One row per sample: (x, y, vx, vy)
+        self.table = []
+        for i in range(samples):
+            E = solve_kepler(mean_motion * i * self.step, eccentricity)
+            E_rate = mean_motion / (1 - eccentricity * math.cos(E))
+            self.table.append((
+                semi_major * math.cos(E),
+                semi_minor * math.sin(E) * vertical_scale,
+                -semi_major * math.sin(E) * E_rate,
+                semi_minor * math.cos(E) * E_rate * vertical_scale
+            ))
+
+        # Upper bound on speed, with headroom for interpolation overshoot
+        self.max_speed = max(math.hypot(row[2], row[3]) for row in self.table) * 1.01
+
+    def state_at(self, time):
+        """Return (x, y, vx, vy) relative to the orbit center at a time in ticks."""
+        position = (time % self.period) / self.step
+        i = int(position)
+        if i >= self.samples:  # Guard against float rounding at the period edge
+            i = self.samples - 1
+        s = position - i
+
+        x0, y0, vx0, vy0 = self.table[i]
+        x1, y1, vx1, vy1 = self.table[(i + 1) % self.samples]
+
+        # Cubic Hermite basis functions and their derivatives
+        s2 = s * s
+        s3 = s2 * s
+        h00 = 2 * s3 - 3 * s2 + 1
+        h10 = s3 - 2 * s2 + s
+        h01 = -2 * s3 + 3 * s2
+        h11 = s3 - s2
+        d00 = 6 * s2 - 6 * s
+        d10 = 3 * s2 - 4 * s + 1
+        d11 = 3 * s2 - 2 * s
+
+        # Tangents are scaled by the sample spacing
+        h = self.step
+        x = h00 * x0 + h10 * h * vx0 + h01 * x1 + h11 * h * vx1
+        y = h00 * y0 + h10 * h * vy0 + h01 * y1 + h11 * h * vy1
+        vx = (d00 * x0 - d00 * x1) / h + d10 * vx0 + d11 * vx1
+        vy = (d00 * y0 - d00 * y1) / h + d10 * vy0 + d11 * vy1
+        return x, y, vx, vy
@@ -1,5 +1,8 @@
 import math
-from settings import GRAVITY, EARTH_POSITION, EARTH_RADIUS
+from settings import (
+    GRAVITY, EARTH_POSITION, EARTH_RADIUS, INITIAL_FUEL, FUEL_WARNING_FRACTION,
+    MAX_DOCKING_SPEED, DOCKING_ALIGNMENT_THRESHOLD, DRAG
+)
 
 def apply_gravity(obj, distance_factor=1.0):
     """
@@ -42,6 +45,42 @@ def apply_thrust(obj, thrust_power, angle=90):
     obj.velocity_x += thrust_x
     obj.velocity_y += thrust_y
 
+def coast(obj, ticks, on_tick=None):
+    """
+    Advance an object by several ticks of gravity and drag with no thrust.
+    
+    This performs the same operations in the same order as Rocket.update
+    with no controls held, so the result matches ticking one at a time
+    exactly, but without the per-tick attribute and function call overhead.
+    
+    Args:
+        obj: Object with position, velocity attributes
+        ticks: Number of ticks to advance
+        on_tick: Optional function called after each tick with the tick
+            index and the new x, y, velocity_x and velocity_y
+    """
+    x, y = obj.x, obj.y
+    velocity_x, velocity_y = obj.velocity_x, obj.velocity_y
+    earth_x, earth_y = EARTH_POSITION
+    
+    for tick in range(ticks):
+        # Same gravity as apply_gravity
+        distance_to_earth = math.sqrt((x - earth_x)**2 + (y - earth_y)**2)
+        normalized_distance = EARTH_RADIUS / max(distance_to_earth, EARTH_RADIUS)
+        velocity_y += GRAVITY * normalized_distance**2
+        
+        # Move, then apply drag
+        x += velocity_x
+        y += velocity_y
+        velocity_x *= DRAG
+        velocity_y *= DRAG
+        
+        if on_tick is not None:
+            on_tick(tick, x, y, velocity_x, velocity_y)
+    
+    obj.x, obj.y = x, y
+    obj.velocity_x, obj.velocity_y = velocity_x, velocity_y
+
 def calculate_distance(obj1, obj2):
     """Calculate distance between two objects with x, y attributes."""
     return math.sqrt((obj1.x - obj2.x)**2 + (obj1.y - obj2.y)**2)
@@ -78,4 +117,45 @@ def check_docking_alignment(rocket, iss, threshold):
     # This is a simplified alignment check
     # In a more advanced version, you would check the rocket's angle as well
     horizontal_alignment = abs(rocket.x - iss.docking_port_x) < threshold
-    return horizontal_alignment
\ No newline at end of file
+    return horizontal_alignment
+
+class FlightMetrics:
+    """
+    Distance, approach and warning values for the current tick.
+
+    GameState updates one instance in place after every simulation tick, and
+    the docking rules, HUD and audio warnings all read from it, so each value
+    is computed once and the HUD shows exactly what the rules judge.
+    """
+    __slots__ = (
+        'distance', 'port_distance', 'approach_speed', 'velocity',
+        'alignment_offset', 'aligned', 'loosely_aligned', 'colliding',
+        'speed_warning', 'fuel_warning'
+    )
+
+    def __init__(self):
+        self.distance = 0.0  # Rocket to ISS center
+        self.port_distance = 0.0  # Rocket to docking port
+        self.approach_speed = 0.0  # Closing speed towards the ISS (unsigned)
+        self.velocity = 0.0  # Rocket speed
+        self.alignment_offset = 0.0  # Horizontal offset from the docking port
+        self.aligned = False  # Within the docking alignment threshold
+        self.loosely_aligned = False  # Within twice the threshold (no crash on contact)
+        self.colliding = False  # Touching the ISS
+        self.speed_warning = False
+        self.fuel_warning = False
+
+    def update(self, rocket, iss):
+        """Recompute every metric from the rocket and ISS state."""
+        self.distance = calculate_distance(rocket, iss)
+        self.port_distance = math.sqrt(
+            (rocket.x - iss.docking_port_x)**2 + (rocket.y - iss.docking_port_y)**2
+        )
+        self.approach_speed = abs(calculate_approach_speed(rocket, iss))
+        self.velocity = rocket.get_velocity_magnitude()
+        self.alignment_offset = rocket.x - iss.docking_port_x
+        self.aligned = abs(self.alignment_offset) < DOCKING_ALIGNMENT_THRESHOLD
+        self.loosely_aligned = abs(self.alignment_offset) < DOCKING_ALIGNMENT_THRESHOLD * 2
+        self.colliding = self.distance < rocket.collision_radius + iss.collision_radius
+        self.speed_warning = self.approach_speed >= MAX_DOCKING_SPEED
+        self.fuel_warning = rocket.fuel < INITIAL_FUEL * FUEL_WARNING_FRACTION
@@ -0,0 +1,74 @@
+import time
+from collections import deque
+from settings import FPS
+
+class FrameProfiler:
+    """
+    Rolling per-section frame timings.
+
+    Call begin_frame() at the start of each frame and mark(name) after each
+    section; the time since the previous mark is recorded under that name.
+    """
+    def __init__(self, window=FPS):
+        self.window = window
+        self.samples = {}
+        self.frame_times = deque(maxlen=window)
+        self.frame_start = time.perf_counter()
+        self.last_mark = self.frame_start
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        self.frame_times.append((now - self.frame_start) * 1000)
+        self.frame_start = now
+        self.last_mark = now
+
+    def mark(self, name):
+        now = time.perf_counter()
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.window)
+        self.samples[name].append((now - self.last_mark) * 1000)
+        self.last_mark = now
+
+    def elapsed(self):
+        """Milliseconds since the current frame began."""
+        return (time.perf_counter() - self.frame_start) * 1000
+
+    def average(self, name):
+        """Average time in milliseconds spent in a section."""
+        samples = self.samples.get(name)
+        if not samples:
+            return 0.0
+        return sum(samples) / len(samples)
+
+    def average_frame_time(self):
+        """Average wall-clock time between frames in milliseconds."""
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def report(self):
+        """Format the rolling averages as a single line."""
+        frame_ms = self.average_frame_time()
+        fps = 1000 / frame_ms if frame_ms > 0 else 0
+        sections = "  ".join(f"{name}={self.average(name):.2f}ms" for name in self.samples)
+        return f"frame={frame_ms:.2f}ms ({fps:.0f} FPS)  {sections}"
+
+
+class TickJitter:
+    """Rolling deviation of tick intervals from the target tick length."""
+    def __init__(self, target_ms=1000 / FPS, window=FPS * 2):
+        self.target_ms = target_ms
+        self.deviations = deque(maxlen=window)
+
+    def record(self, interval_ms):
+        self.deviations.append(abs(interval_ms - self.target_ms))
+
+    def average(self):
+        """Average deviation from the target tick length in milliseconds."""
+        if not self.deviations:
+            return 0.0
+        return sum(self.deviations) / len(self.deviations)
+
+    def maximum(self):
+        """Largest deviation in the window in milliseconds."""
+        return max(self.deviations) if self.deviations else 0.0
@@ -0,0 +1,221 @@
+import pygame
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, BLACK, THRUSTER_LENGTH, THRUSTER_WIDTH,
+    TRAJECTORY_COLOR
+)
+
+def merge_rects(rects):
+    """Combine overlapping rects, so no area is cleared or uploaded twice."""
+    merged = []
+    for rect in rects:
+        if not rect.width or not rect.height:
+            continue
+        rect = pygame.Rect(rect)
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+class SurfaceRenderer:
+    """Draws everything by blitting onto the display surface on the CPU."""
+    name = "surface"
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.frame = 0
+
+        # Kept for parity with SDL2Renderer; the HUD is drawn every frame
+        self.hud_interval = 1
+
+    def draw_background(self, stars_bg, earth_image, earth_pos):
+        # earth_image is None when Earth is already part of the background
+        self.screen.fill(BLACK)
+        self.screen.blit(stars_bg, (0, 0))
+        if earth_image is not None:
+            self.screen.blit(earth_image, earth_pos)
+
+    def draw_rocket(self, rocket):
+        rocket.draw(self.screen)
+
+    def draw_iss(self, iss):
+        iss.draw(self.screen)
+
+    def draw_trajectory(self, points, closest_point):
+        if len(points) > 1:
+            pygame.draw.lines(self.screen, TRAJECTORY_COLOR, False, points)
+        if closest_point is not None:
+            pygame.draw.circle(self.screen, TRAJECTORY_COLOR, closest_point, 4, 1)
+
+    def draw_overlay(self, key, draw_function):
+        # Blitting a cached HUD layer costs about as much as drawing the HUD
+        # text directly, so this backend always draws it and hud_interval
+        # only saves work on the SDL2 renderer
+        draw_function(self.screen)
+
+    def get_frame(self):
+        """Surface holding the frame drawn so far."""
+        return self.screen
+
+    def present(self):
+        self.frame += 1
+        pygame.display.flip()
+
+
+class SDL2Renderer:
+    """
+    Draws the scene as GPU textures using pygame._sdl2.video.
+
+    Sprites are uploaded once and rotated per draw by the renderer, and the
+    HUD is only re-rendered and re-uploaded when its content key changes.
+    """
+    name = "sdl2"
+
+    def __init__(self, window, accelerated=True):
+        from pygame._sdl2.video import Renderer, Texture
+        self.Texture = Texture
+        self.renderer = Renderer(window, accelerated=1 if accelerated else 0)
+        self.accelerated = accelerated
+
+        self.textures = {}
+        self.background = None
+        self.background_key = None
+        self.frame = 0
+
+        # HUD layer, re-uploaded only when its content changes and at most
+        # every hud_interval frames
+        self.hud_interval = 1
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.overlay_texture = self.Texture.from_surface(self.renderer, self.overlay)
+        self.overlay_rects = []
+        self.overlay_key = None
+        self.next_overlay_frame = 0
+
+        # Thruster flame pointing down from its attachment point at the top
+        flame = pygame.Surface((THRUSTER_WIDTH, THRUSTER_LENGTH), pygame.SRCALPHA)
+        pygame.draw.polygon(
+            flame, (255, 165, 0),
+            [(0, 0), (THRUSTER_WIDTH, 0), (THRUSTER_WIDTH / 2, THRUSTER_LENGTH)]
+        )
+        self.flame_texture = self.Texture.from_surface(self.renderer, flame)
+
+        self.port_texture = None
+
+    def get_texture(self, surface):
+        """Upload a surface once and reuse the texture on later frames."""
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+        return texture
+
+    def draw_background(self, stars_bg, earth_image, earth_pos):
+        # Stars and Earth never move, so combine them into one texture
+        if self.background_key != (stars_bg, earth_image):
+            combined = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            combined.fill(BLACK)
+            combined.blit(stars_bg, (0, 0))
+            if earth_image is not None:
+                combined.blit(earth_image, earth_pos)
+            self.background = self.Texture.from_surface(self.renderer, combined)
+            self.background_key = (stars_bg, earth_image)
+        self.background.draw()
+
+    def draw_rocket(self, rocket):
+        texture = self.get_texture(rocket.original_image)
+        rect = texture.get_rect(center=(rocket.x, rocket.y))
+        # Same orientation as transform.rotate(image, -angle + 90)
+        texture.draw(dstrect=rect, angle=rocket.angle - 90)
+
+        if rocket.is_thrusting and rocket.fuel > 0 and rocket.thruster_effects:
+            flame_x, flame_y = rocket.get_thruster_position()
+            flame_rect = (flame_x - THRUSTER_WIDTH / 2, flame_y, THRUSTER_WIDTH, THRUSTER_LENGTH)
+            self.flame_texture.draw(
+                dstrect=flame_rect, angle=90 - rocket.angle,
+                origin=(THRUSTER_WIDTH / 2, 0)
+            )
+
+    def draw_iss(self, iss):
+        texture = self.get_texture(iss.image)
+        texture.draw(dstrect=texture.get_rect(center=(iss.x, iss.y)))
+
+        if self.port_texture is None:
+            port = pygame.Surface((12, 12), pygame.SRCALPHA)
+            iss.draw_docking_port(port, (6, 6))
+            self.port_texture = self.Texture.from_surface(self.renderer, port)
+        self.port_texture.draw(
+            dstrect=self.port_texture.get_rect(
+                center=(int(iss.docking_port_x), int(iss.docking_port_y))
+            )
+        )
+
+    def draw_trajectory(self, points, closest_point):
+        self.renderer.draw_color = TRAJECTORY_COLOR + (255,)
+        draw_line = self.renderer.draw_line
+        previous = None
+        for point in points:
+            if previous is not None:
+                draw_line(previous, point)
+            previous = point
+        if closest_point is not None:
+            x, y = closest_point
+            self.renderer.draw_rect((x - 4, y - 4, 8, 8))
+
+    def draw_overlay(self, key, draw_function):
+        if key != self.overlay_key and self.frame >= self.next_overlay_frame:
+            # Only clear and upload the areas drawn to, before and now;
+            # draw_function returns the rects it drew
+            for rect in self.overlay_rects:
+                self.overlay.fill((0, 0, 0, 0), rect)
+            rects = merge_rects(draw_function(self.overlay))
+            for rect in merge_rects(self.overlay_rects + rects):
+                rect = rect.clip(self.overlay.get_rect())
+                if rect.width and rect.height:
+                    self.overlay_texture.update(self.overlay.subsurface(rect), rect)
+            self.overlay_rects = rects
+            self.overlay_key = key
+            self.next_overlay_frame = self.frame + self.hud_interval
+        self.overlay_texture.draw()
+
+    def get_frame(self):
+        """Read the frame drawn so far back from the renderer."""
+        return self.renderer.to_surface()
+
+    def present(self):
+        # The opaque background texture covers the whole target, so the
+        # next frame does not need a clear
+        self.frame += 1
+        self.renderer.present()
+
+
+def create_renderer(name):
+    """
+    Create the display and a renderer for it.
+
+    "sdl2" tries a GPU renderer, then SDL's software renderer, and finally
+    falls back to plain surface blitting if pygame._sdl2 is unavailable.
+    """
+    if name == "sdl2":
+        try:
+            from pygame._sdl2 import error as SDLError
+            from pygame._sdl2.video import Window
+        except ImportError as e:
+            print("SDL2 renderer unavailable, using surface renderer")
+            print(e)
+        else:
+            # A window that owns a display surface cannot get a renderer, so the
+            # display module only gets a hidden window for image conversion
+            screen = pygame.display.set_mode((1, 1), pygame.HIDDEN)
+            window = Window(TITLE, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            for accelerated in (True, False):
+                try:
+                    return screen, SDL2Renderer(window, accelerated)
+                except (pygame.error, SDLError) as e:
+                    print(f"Unable to create SDL2 renderer (accelerated={accelerated})")
+                    print(e)
+            window.destroy()
+            print("Using surface renderer")
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return screen, SurfaceRenderer(screen)
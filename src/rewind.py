@@ -0,0 +1,81 @@
+from array import array
+from settings import FPS, REWIND_SECONDS, REWIND_KEYFRAME_INTERVAL
+
+# Number of float fields in a GameState snapshot (x, y, angle, vx, vy, fuel, iss_time)
+SNAPSHOT_FLOATS = 7
+
+class RewindBuffer:
+    """
+    Fixed-size ring buffer holding the last few seconds of GameState snapshots.
+
+    Every REWIND_KEYFRAME_INTERVAL ticks a full-precision keyframe is stored.
+    All other ticks store float32 deltas against their keyframe (not against
+    the previous tick), so restoring any tick is a single keyframe + delta add.
+    All storage is preallocated, so memory use stays flat while recording.
+    """
+    def __init__(self, seconds=REWIND_SECONDS, keyframe_interval=REWIND_KEYFRAME_INTERVAL):
+        self.capacity = max(1, int(seconds * FPS))
+        self.keyframe_interval = max(1, keyframe_interval)
+
+        # Enough keyframe slots to cover every tick still held in the ring
+        self.keyframe_slots = -(-self.capacity // self.keyframe_interval) + 1
+
+        self.keyframes = array('d', [0.0]) * (self.keyframe_slots * SNAPSHOT_FLOATS)
+        self.deltas = array('f', [0.0]) * (self.capacity * SNAPSHOT_FLOATS)
+        self.flags = array('H', [0]) * self.capacity
+
+        # Absolute tick numbers: ticks in [start, end) are available
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def clear(self):
+        """Forget all recorded ticks."""
+        self.start = 0
+        self.end = 0
+
+    def record(self, snapshot):
+        """Append a snapshot tuple (SNAPSHOT_FLOATS floats followed by packed flags)."""
+        tick = self.end
+        kf = ((tick // self.keyframe_interval) % self.keyframe_slots) * SNAPSHOT_FLOATS
+        slot = (tick % self.capacity) * SNAPSHOT_FLOATS
+
+        # Start a new keyframe at the beginning of each interval
+        if tick % self.keyframe_interval == 0:
+            for i in range(SNAPSHOT_FLOATS):
+                self.keyframes[kf + i] = snapshot[i]
+
+        for i in range(SNAPSHOT_FLOATS):
+            self.deltas[slot + i] = snapshot[i] - self.keyframes[kf + i]
+        self.flags[tick % self.capacity] = snapshot[SNAPSHOT_FLOATS]
+
+        self.end = tick + 1
+        if self.end - self.start > self.capacity:
+            self.start = self.end - self.capacity
+
+    def get(self, tick):
+        """Return the snapshot tuple recorded at an absolute tick."""
+        if not self.start <= tick < self.end:
+            raise IndexError(f"Tick {tick} is not in the rewind buffer")
+
+        kf = ((tick // self.keyframe_interval) % self.keyframe_slots) * SNAPSHOT_FLOATS
+        slot = (tick % self.capacity) * SNAPSHOT_FLOATS
+        keyframes = self.keyframes
+        deltas = self.deltas
+        return (
+            keyframes[kf] + deltas[slot],
+            keyframes[kf + 1] + deltas[slot + 1],
+            keyframes[kf + 2] + deltas[slot + 2],
+            keyframes[kf + 3] + deltas[slot + 3],
+            keyframes[kf + 4] + deltas[slot + 4],
+            keyframes[kf + 5] + deltas[slot + 5],
+            keyframes[kf + 6] + deltas[slot + 6],
+            self.flags[tick % self.capacity]
+        )
+
+    def truncate(self, tick):
+        """Drop every tick after the given one, e.g. when resuming from a rewind."""
+        if self.start <= tick < self.end:
+            self.end = tick + 1
@@ -2,14 +2,23 @@ import pygame
 import math
 from settings import (
     THRUST_POWER, ROTATION_SPEED, INITIAL_FUEL, 
-    FUEL_CONSUMPTION_RATE, RCS_THRUST_POWER, RCS_FUEL_CONSUMPTION
+    FUEL_CONSUMPTION_RATE, RCS_THRUST_POWER, RCS_FUEL_CONSUMPTION,
+    THRUSTER_LENGTH, THRUSTER_WIDTH, DRAG
 )
 from physics import apply_gravity, apply_thrust
+from utils import convert_image
 
 class Rocket:
     def __init__(self, x, y):
-        self.original_image = pygame.image.load("assets/images/rocket.png").convert_alpha()
+        # Not converted when running without a display (simulation process)
+        self.original_image = convert_image(pygame.image.load("assets/images/rocket.png"))
         self.image = self.original_image
+        self.image_angle = None  # Angle self.image was last rotated to
+        
+        # Detail settings, lowered by the quality governor
+        self.rotation_step = 0  # Snap rotation to this many degrees and cache (0 = exact)
+        self.rotation_cache = {}
+        self.thruster_effects = True
         self.rect = self.image.get_rect()
         
         # Position and movement
@@ -65,33 +74,43 @@ class Rocket:
         self.y += self.velocity_y
         
         # Apply drag (very slight in space)
-        self.velocity_x *= 0.995
-        self.velocity_y *= 0.995
-        
-        # Update the rocket image based on the current angle
-        self.image = pygame.transform.rotate(self.original_image, -self.angle + 90)
+        self.velocity_x *= DRAG
+        self.velocity_y *= DRAG
+    
+    def update_image(self):
+        """Rotate the rocket image to the current angle and position."""
+        # Only re-rotate when the angle changed since the last draw
+        if self.image_angle != self.angle:
+            if self.rotation_step:
+                # Reuse a cached image at the nearest snapped angle
+                snapped = round(self.angle / self.rotation_step) * self.rotation_step % 360
+                if snapped not in self.rotation_cache:
+                    self.rotation_cache[snapped] = pygame.transform.rotate(self.original_image, -snapped + 90)
+                self.image = self.rotation_cache[snapped]
+            else:
+                self.image = pygame.transform.rotate(self.original_image, -self.angle + 90)
+            self.image_angle = self.angle
         self.rect = self.image.get_rect(center=(self.x, self.y))
     
     def draw(self, screen):
         # Draw the rocket at its current position and rotation
+        self.update_image()
         screen.blit(self.image, self.rect)
         
         # Draw thruster flames if thrusting
-        if self.is_thrusting and self.fuel > 0:
+        if self.is_thrusting and self.fuel > 0 and self.thruster_effects:
             self.draw_thruster(screen)
     
     def draw_thruster(self, screen):
         # This is a simple thruster visualization
         # In a real implementation, you would use animated flame sprites
         
-        # Calculate thruster position at the bottom of the rocket
-        thruster_length = 20
-        thruster_width = 10
+        thruster_length = THRUSTER_LENGTH
+        thruster_width = THRUSTER_WIDTH
         
         # Calculate the position at the bottom of the rocket
         angle_rad = math.radians(self.angle)
-        flame_x = self.x - math.cos(angle_rad) * self.height/2
-        flame_y = self.y + math.sin(angle_rad) * self.height/2
+        flame_x, flame_y = self.get_thruster_position()
         
         # Draw a simple flame triangle
         points = [
@@ -106,6 +125,20 @@ class Rocket:
         
         pygame.draw.polygon(screen, (255, 165, 0), points)  # Orange flame
         
+    def set_rotation_step(self, step):
+        """Change rotation snapping, dropping cached images from the old step."""
+        if step != self.rotation_step:
+            self.rotation_step = step
+            self.rotation_cache = {}
+            self.image_angle = None
+    
+    def get_thruster_position(self):
+        """Get the point at the bottom of the rocket where the flame starts."""
+        angle_rad = math.radians(self.angle)
+        flame_x = self.x - math.cos(angle_rad) * self.height/2
+        flame_y = self.y + math.sin(angle_rad) * self.height/2
+        return flame_x, flame_y
+    
     def get_velocity_magnitude(self):
         """Get the total velocity magnitude."""
         return math.sqrt(self.velocity_x**2 + self.velocity_y**2)
@@ -125,4 +158,33 @@ class Rocket:
         self.is_thrusting = False
         self.is_rotating_left = False
         self.is_rotating_right = False
-        self.is_using_rcs = False
\ No newline at end of file
+        self.is_using_rcs = False
+    
+    def get_control_flags(self):
+        """Pack the control inputs into a small bitfield."""
+        return (
+            (1 if self.is_thrusting else 0) |
+            (2 if self.is_rotating_left else 0) |
+            (4 if self.is_rotating_right else 0) |
+            (8 if self.is_using_rcs else 0)
+        )
+    
+    def set_control_flags(self, flags):
+        """Restore control inputs packed by get_control_flags."""
+        self.is_thrusting = bool(flags & 1)
+        self.is_rotating_left = bool(flags & 2)
+        self.is_rotating_right = bool(flags & 4)
+        self.is_using_rcs = bool(flags & 8)
+    
+    def get_state(self):
+        """Return the kinematic state as (x, y, angle, vx, vy, fuel)."""
+        return (self.x, self.y, self.angle, self.velocity_x, self.velocity_y, self.fuel)
+    
+    def set_state(self, x, y, angle, velocity_x, velocity_y, fuel):
+        """Restore a kinematic state returned by get_state."""
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.velocity_x = velocity_x
+        self.velocity_y = velocity_y
+        self.fuel = fuel
\ No newline at end of file
@@ -19,11 +19,16 @@ GREY = (100, 100, 100)
 GRAVITY = 0.1  # Gravity force pulling downwards
 THRUST_POWER = 0.2  # Rocket thrust power
 ROTATION_SPEED = 3  # Rotation speed in degrees
+DRAG = 0.995  # Velocity kept per tick (very slight drag in space)
 INITIAL_FUEL = 1000  # Initial fuel amount
 FUEL_CONSUMPTION_RATE = 1  # Fuel consumption per thrust
 RCS_THRUST_POWER = 0.05  # Fine-tuned RCS thrust power
 RCS_FUEL_CONSUMPTION = 0.5  # RCS fuel consumption rate
 
+# Thruster flame dimensions
+THRUSTER_LENGTH = 20
+THRUSTER_WIDTH = 10
+
 # Earth settings
 EARTH_POSITION = (SCREEN_WIDTH // 2, SCREEN_HEIGHT + 300)
 EARTH_RADIUS = 400
@@ -34,10 +39,60 @@ ISS_Y = 100
 DOCKING_PORT_OFFSET_X = 0  # Offset from ISS center
 DOCKING_PORT_OFFSET_Y = 20  # Offset from ISS center
 
+# ISS orbit around (ISS_X, ISS_Y); set the semi-major axis to 0 for a fixed ISS
+ISS_ORBIT_SEMI_MAJOR = 150  # Pixels
+ISS_ORBIT_ECCENTRICITY = 0.3
+ISS_ORBIT_INCLINATION = 80  # Degrees; flattens the orbit as seen on screen
+ISS_ORBIT_PERIOD = 60  # Seconds per orbit
+ISS_EPHEMERIS_SAMPLES = 360  # Precomputed orbit samples
+
 # Docking parameters
 MAX_DOCKING_SPEED = 2.0  # Maximum speed allowed for successful docking
 DOCKING_ALIGNMENT_THRESHOLD = 10  # Pixels of alignment tolerance
 DOCKING_DISTANCE_THRESHOLD = 20  # Distance at which docking is possible
+FUEL_WARNING_FRACTION = 0.25  # Fuel fraction below which the fuel warning sounds
+DRIFT_MARGIN = 200  # Pixels beyond the screen edge before the rocket is lost
+
+# Rendering settings
+RENDERER = "surface"  # "surface" (CPU blitting) or "sdl2" (GPU textures)
+PROFILE_REPORT_INTERVAL = 2  # Seconds between frame profile reports
+SPLIT_SIMULATION = False  # Step the simulation in its own process (--split-sim)
+
+# Adaptive quality settings
+# Each tier gives up one more piece of detail than the one before it
+QUALITY_TIERS = (
+    {'stars': 150, 'bake_earth': False, 'hud_interval': 1, 'rotation_step': 0, 'thruster': True},
+    {'stars': 75, 'bake_earth': False, 'hud_interval': 1, 'rotation_step': 0, 'thruster': True},
+    {'stars': 75, 'bake_earth': True, 'hud_interval': 1, 'rotation_step': 0, 'thruster': True},
+    {'stars': 75, 'bake_earth': True, 'hud_interval': 4, 'rotation_step': 0, 'thruster': True},
+    {'stars': 75, 'bake_earth': True, 'hud_interval': 4, 'rotation_step': 6, 'thruster': True},
+    {'stars': 75, 'bake_earth': True, 'hud_interval': 4, 'rotation_step': 6, 'thruster': False},
+)
+QUALITY_WINDOW = 30  # Frames averaged for each decision
+QUALITY_COOLDOWN = 60  # Frames to wait after a change before deciding again
+QUALITY_DOWN_THRESHOLD = 0.9  # Step down above this fraction of the frame budget
+QUALITY_UP_THRESHOLD = 0.5  # Step up below this fraction of the frame budget
+
+# Frame capture settings
+CAPTURE_DIRECTORY = "captures"  # Where highlight clips are written
+CAPTURE_QUEUE_SIZE = 30  # Frames waiting to be written before new ones are dropped
+CAPTURE_WORKERS = 2  # Threads writing PNG frames
+HIGHLIGHT_FRAMES_PER_TICK = 2  # Highlight frames drawn per game frame while exporting
+
+# Trajectory prediction settings
+SHOW_TRAJECTORY = True  # Draw the predicted path (toggle with T)
+PREDICTION_SECONDS = 5  # How far ahead the path is predicted
+PREDICTION_TOLERANCE = 0.5  # Pixels of drift allowed before re-predicting
+TRAJECTORY_COLOR = (0, 200, 255)
+
+# Time warp settings
+TIME_WARP_LEVELS = (1, 2, 5, 10, 25, 50, 100)  # Simulation ticks per frame
+TIME_WARP_SAFE_DISTANCE = 150  # Warp drops back to 1x this close to the ISS
+
+# Rewind settings
+REWIND_SECONDS = 10  # How much simulation history is kept for rewinding
+REWIND_KEYFRAME_INTERVAL = 30  # Ticks between full keyframe snapshots
+REWIND_SCRUB_SPEED = 2  # Ticks stepped per frame while scrubbing
 
 # Game states
 STATE_MENU = 0
@@ -45,6 +100,7 @@ STATE_PLAYING = 1
 STATE_SUCCESS = 2
 STATE_FAILURE = 3
 STATE_PAUSED = 4
+STATE_REWIND = 5
 
 # Asset paths
 ROCKET_IMAGE = "assets/images/rocket.png"
@@ -0,0 +1,187 @@
+import queue
+import struct
+import time
+import multiprocessing
+from collections import namedtuple
+from multiprocessing import shared_memory
+from settings import FPS, STATE_PLAYING
+from profiler import TickJitter
+from game_state import GameState
+
+# One published state: a write sequence number followed by
+# GameState snapshot (8), tick, time warp index, last command seq, jitter avg, jitter max
+BUFFER = struct.Struct('<q13d')
+SEQUENCE = struct.Struct('<q')
+PAYLOAD = struct.Struct('<13d')  # BUFFER after its sequence number
+HEADER = struct.Struct('<q')  # Index of the buffer readers should use
+
+SimulationFrame = namedtuple(
+    'SimulationFrame',
+    ['snapshot', 'tick', 'time_warp_index', 'command_seq', 'jitter_average', 'jitter_max']
+)
+
+class SharedState:
+    """
+    Double-buffered GameState snapshot in shared memory.
+
+    The writer fills the buffer readers are not using and then flips the
+    header to point at it. Each buffer carries a sequence number that is odd
+    while it is being written, so a reader can detect and retry a torn read.
+    """
+    size = HEADER.size + 2 * BUFFER.size
+
+    def __init__(self, name=None):
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=self.size)
+            self.memory.buf[:self.size] = bytes(self.size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        self.sequence = 0
+
+    def offset(self, index):
+        return HEADER.size + index * BUFFER.size
+
+    def publish(self, values):
+        """Write the values (everything after the sequence number) and flip buffers."""
+        buf = self.memory.buf
+        back = 1 - HEADER.unpack_from(buf, 0)[0]
+        offset = self.offset(back)
+
+        # Mark the buffer as being written before touching the payload and
+        # only store the final (even) sequence number once it is complete
+        self.sequence += 1
+        SEQUENCE.pack_into(buf, offset, 2 * self.sequence - 1)
+        PAYLOAD.pack_into(buf, offset + SEQUENCE.size, *values)
+        SEQUENCE.pack_into(buf, offset, 2 * self.sequence)
+        HEADER.pack_into(buf, 0, back)
+
+    def read(self, attempts=100):
+        """
+        Return the latest published values, or None if nothing was published
+        yet or no consistent copy could be read in the given attempts (e.g.
+        the writer died while writing).
+        """
+        buf = self.memory.buf
+        for _ in range(attempts):
+            front = HEADER.unpack_from(buf, 0)[0]
+            values = BUFFER.unpack_from(buf, self.offset(front))
+            if values[0] == 0:
+                return None
+            if values[0] % 2 == 1:
+                continue
+            # Make sure the writer did not start on this buffer while we read it
+            if SEQUENCE.unpack_from(buf, self.offset(front))[0] == values[0]:
+                return values[1:]
+        return None
+
+    def close(self):
+        self.memory.close()
+
+    def unlink(self):
+        self.memory.unlink()
+
+
+def run_simulation(shared_name, commands):
+    """Entry point of the simulation process: step GameState at a fixed rate."""
+    shared = SharedState(shared_name)
+    game_state = GameState()
+    jitter = TickJitter()
+    parent = multiprocessing.parent_process()
+
+    tick = 0
+    command_seq = 0
+    tick_length = 1 / FPS
+    next_tick = time.perf_counter()
+    last_tick = None
+
+    while True:
+        # Apply input forwarded from the render process
+        while True:
+            try:
+                command = commands.get_nowait()
+            except queue.Empty:
+                break
+            command_seq, name, value = command
+            if name == 'quit':
+                shared.close()
+                return
+            elif name == 'controls':
+                game_state.rocket.set_control_flags(value)
+            elif name == 'start':
+                game_state.current_state = STATE_PLAYING
+            elif name == 'reset':
+                game_state.reset_game()
+            elif name == 'time_warp':
+                game_state.change_time_warp(value)
+
+        now = time.perf_counter()
+        if last_tick is not None:
+            jitter.record((now - last_tick) * 1000)
+        last_tick = now
+
+        game_state.update_frame()
+        tick += 1
+        shared.publish(game_state.save_snapshot() + (
+            tick, game_state.time_warp_index, command_seq,
+            jitter.average(), jitter.maximum()
+        ))
+
+        # Stop if the render process went away without saying so
+        if tick % FPS == 0 and parent is not None and not parent.is_alive():
+            shared.close()
+            return
+
+        # Sleep until the next tick, without trying to catch up after a long stall
+        next_tick += tick_length
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -5 * tick_length:
+            next_tick = time.perf_counter()
+
+
+class SimulationProcess:
+    """Render-side handle on a simulation running in its own process."""
+    def __init__(self):
+        context = multiprocessing.get_context('spawn')
+        self.shared = SharedState()
+        self.commands = context.Queue()
+        self.command_seq = 0
+        self.process = context.Process(
+            target=run_simulation, args=(self.shared.name, self.commands), daemon=True
+        )
+        self.process.start()
+
+    def send(self, name, value=None):
+        """Forward a command; returns its sequence number."""
+        self.command_seq += 1
+        self.commands.put((self.command_seq, name, value))
+        return self.command_seq
+
+    def read(self):
+        """
+        Latest state published by the simulation, or None before the first tick.
+        
+        Raises RuntimeError if the simulation process is no longer running.
+        """
+        if not self.process.is_alive():
+            raise RuntimeError(f"Simulation process exited with code {self.process.exitcode}")
+        values = self.shared.read()
+        if values is None:
+            return None
+        # Everything is stored as a double; the snapshot flags are a bitfield
+        snapshot = values[:7] + (int(values[7]),)
+        return SimulationFrame(
+            snapshot, int(values[8]), int(values[9]), int(values[10]), values[11], values[12]
+        )
+
+    def stop(self):
+        self.send('quit')
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        # Don't wait at exit to flush commands nobody will read
+        self.commands.cancel_join_thread()
+        self.shared.close()
+        self.shared.unlink()
@@ -0,0 +1,87 @@
+import math
+from collections import deque
+from rocket import Rocket
+from settings import FPS, PREDICTION_SECONDS, PREDICTION_TOLERANCE
+
+class TrajectoryPredictor:
+    """
+    Predicts the rocket's path for the next few seconds.
+
+    The rollout runs Rocket.update on a private probe rocket, so it uses
+    exactly the same gravity, drag and control handling as the real one.
+    While the controls stay the same and the rocket is where the previous
+    prediction said it would be, the path is shifted forward by the elapsed
+    ticks instead of being recomputed.
+    """
+    def __init__(self, seconds=PREDICTION_SECONDS, tolerance=PREDICTION_TOLERANCE):
+        self.length = max(1, int(seconds * FPS))
+        self.tolerance = tolerance
+        self.probe = Rocket(0, 0)
+
+        # points[k] is the predicted (x, y) at ISS time start_time + k
+        self.points = deque(maxlen=self.length)
+        self.port_distances = deque(maxlen=self.length)
+        self.start_time = None
+        self.flags = None
+
+        # Closest predicted approach to the docking port
+        self.closest_point = None
+        self.closest_distance = None
+
+    def clear(self):
+        self.points.clear()
+        self.port_distances.clear()
+        self.start_time = None
+        self.closest_point = None
+        self.closest_distance = None
+
+    def update(self, rocket, iss):
+        """Bring the prediction up to date with the rocket's current state."""
+        time = iss.time
+        flags = rocket.get_control_flags()
+        offset = time - self.start_time if self.start_time is not None else -1
+
+        if flags == self.flags and 0 <= offset < len(self.points):
+            predicted_x, predicted_y = self.points[offset]
+            if (abs(predicted_x - rocket.x) <= self.tolerance and
+                    abs(predicted_y - rocket.y) <= self.tolerance):
+                # Still on track: drop the elapsed ticks and extend the end
+                for _ in range(offset + 1):
+                    self.points.popleft()
+                    self.port_distances.popleft()
+                self.start_time = time + 1
+                self.extend(iss, offset + 1)
+                self.update_closest()
+                return
+
+        self.recompute(rocket, iss)
+
+    def recompute(self, rocket, iss):
+        """Roll out a fresh prediction from the rocket's current state."""
+        self.points.clear()
+        self.port_distances.clear()
+        self.probe.set_state(*rocket.get_state())
+        self.flags = rocket.get_control_flags()
+        self.probe.set_control_flags(self.flags)
+        self.start_time = iss.time + 1
+        self.extend(iss, self.length)
+        self.update_closest()
+
+    def extend(self, iss, steps):
+        # Continue the probe from the last predicted state
+        probe = self.probe
+        time = self.start_time + len(self.points)
+        for _ in range(steps):
+            probe.update()
+            port_x, port_y = iss.get_docking_port_at(time)
+            self.points.append((probe.x, probe.y))
+            self.port_distances.append(math.hypot(probe.x - port_x, probe.y - port_y))
+            time += 1
+
+    def update_closest(self):
+        if not self.port_distances:
+            self.closest_point = None
+            self.closest_distance = None
+            return
+        self.closest_distance = min(self.port_distances)
+        self.closest_point = self.points[self.port_distances.index(self.closest_distance)]
@@ -1,10 +1,12 @@
 import pygame
 from settings import (
     WHITE, BLACK, RED, GREEN, YELLOW, SCREEN_WIDTH, SCREEN_HEIGHT,
-    MAX_DOCKING_SPEED, INITIAL_FUEL
+    MAX_DOCKING_SPEED, INITIAL_FUEL, FPS
 )
 
 class UI:
+    # Each draw method returns the rects it drew to, so a cached HUD layer
+    # only needs those areas cleared and updated
     def __init__(self):
         # Initialize fonts
         pygame.font.init()
@@ -12,38 +14,58 @@ class UI:
         self.font_medium = pygame.font.Font(None, 36)
         self.font_large = pygame.font.Font(None, 72)
         
-        # Warning indicator states
-        self.speed_warning = False
-        self.fuel_warning = False
-        
-    def draw_hud(self, screen, rocket, iss, distance):
+    def draw_hud(self, screen, rocket, metrics, closest_approach=None, time_warp=1):
         # Draw velocity info
-        velocity_text = f"Velocity: {rocket.get_velocity_magnitude():.1f} m/s"
+        velocity_text = f"Velocity: {metrics.velocity:.1f} m/s"
         vel_surface = self.font_small.render(velocity_text, True, WHITE)
-        screen.blit(vel_surface, (10, 10))
+        rects = [screen.blit(vel_surface, (10, 10))]
         
         # Draw fuel gauge
-        self.draw_fuel_bar(screen, rocket.fuel)
+        rects += self.draw_fuel_bar(screen, rocket.fuel, metrics.fuel_warning)
         
-        # Draw distance to ISS
-        distance_text = f"Distance to ISS: {distance:.1f} m"
+        # Draw distance to the docking port, as judged by the docking rules
+        distance_text = f"Distance to Docking Port: {metrics.port_distance:.1f} m"
         dist_surface = self.font_small.render(distance_text, True, WHITE)
-        screen.blit(dist_surface, (10, 40))
+        rects.append(screen.blit(dist_surface, (10, 40)))
+        
+        # Draw predicted closest approach to the docking port
+        if closest_approach is not None:
+            closest_text = f"Closest Approach: {closest_approach:.1f} m"
+            closest_surface = self.font_small.render(closest_text, True, WHITE)
+            rects.append(screen.blit(closest_surface, (10, 70)))
+        
+        # Draw time warp level
+        if time_warp > 1:
+            warp_text = f"Time Warp: {time_warp}x"
+            warp_surface = self.font_small.render(warp_text, True, YELLOW)
+            rects.append(screen.blit(warp_surface, (10, 100)))
         
         # Draw approach speed indicator
-        self.draw_approach_speed(screen, rocket, iss)
+        rects += self.draw_approach_speed(screen, metrics)
         
         # Draw alignment indicator
-        self.draw_alignment_indicator(screen, rocket, iss)
-        
-    def draw_fuel_bar(self, screen, fuel):
+        rects += self.draw_alignment_indicator(screen, metrics)
+        return rects
+    
+    def get_hud_key(self, rocket, metrics):
+        """Values shown by draw_hud, rounded to their displayed precision."""
+        return (
+            round(metrics.velocity, 1),
+            int(rocket.fuel),
+            round(metrics.port_distance, 1),
+            int(metrics.alignment_offset),
+            round(metrics.approach_speed, 1),
+            metrics.speed_warning
+        )
+    
+    def draw_fuel_bar(self, screen, fuel, warning):
         # Draw fuel bar background
         bar_width = 150
         bar_height = 20
         bar_x = SCREEN_WIDTH - bar_width - 10
         bar_y = 10
         
-        pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)
+        rects = [pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)]
         
         # Draw fuel level
         fuel_percentage = max(0, min(1, fuel / INITIAL_FUEL))
@@ -53,22 +75,20 @@ class UI:
         color = GREEN
         if fuel_percentage < 0.5:
             color = YELLOW
-        if fuel_percentage < 0.25:
+        if warning:
             color = RED
-            self.fuel_warning = True
-        else:
-            self.fuel_warning = False
             
-        pygame.draw.rect(screen, color, (bar_x, bar_y, filled_width, bar_height))
+        rects.append(pygame.draw.rect(screen, color, (bar_x, bar_y, filled_width, bar_height)))
         
         # Draw fuel text
         fuel_text = f"Fuel: {int(fuel)}"
         fuel_surface = self.font_small.render(fuel_text, True, WHITE)
-        screen.blit(fuel_surface, (bar_x, bar_y + bar_height + 5))
+        rects.append(screen.blit(fuel_surface, (bar_x, bar_y + bar_height + 5)))
+        return rects
     
-    def draw_approach_speed(self, screen, rocket, iss):
-        # Calculate the vertical component of velocity (for approach)
-        approach_speed = abs(rocket.velocity_y)
+    def draw_approach_speed(self, screen, metrics):
+        # Closing speed towards the ISS, as judged by the docking rules
+        approach_speed = metrics.approach_speed
         
         # Position for the indicator
         indicator_x = SCREEN_WIDTH - 170
@@ -81,18 +101,15 @@ class UI:
         color = GREEN
         if approach_speed > MAX_DOCKING_SPEED * 0.7:
             color = YELLOW
-        if approach_speed > MAX_DOCKING_SPEED:
+        if metrics.speed_warning:
             color = RED
-            self.speed_warning = True
-        else:
-            self.speed_warning = False
             
         speed_surface = self.font_small.render(speed_text, True, color)
-        screen.blit(speed_surface, (indicator_x, indicator_y))
+        return [screen.blit(speed_surface, (indicator_x, indicator_y))]
     
-    def draw_alignment_indicator(self, screen, rocket, iss):
-        # Calculate horizontal alignment
-        x_diff = rocket.x - iss.docking_port_x
+    def draw_alignment_indicator(self, screen, metrics):
+        # Horizontal alignment with the docking port
+        x_diff = metrics.alignment_offset
         
         # Position for the indicator
         indicator_x = SCREEN_WIDTH // 2 - 100
@@ -101,11 +118,11 @@ class UI:
         indicator_height = 20
         
         # Draw alignment bar background
-        pygame.draw.rect(screen, WHITE, (indicator_x, indicator_y, indicator_width, indicator_height), 1)
+        rects = [pygame.draw.rect(screen, WHITE, (indicator_x, indicator_y, indicator_width, indicator_height), 1)]
         
         # Draw center marker
         center_x = indicator_x + indicator_width // 2
-        pygame.draw.line(screen, WHITE, (center_x, indicator_y - 5), (center_x, indicator_y + indicator_height + 5), 2)
+        rects.append(pygame.draw.line(screen, WHITE, (center_x, indicator_y - 5), (center_x, indicator_y + indicator_height + 5), 2))
         
         # Calculate position of alignment indicator
         # Map x_diff from [-100, 100] to [0, indicator_width]
@@ -113,18 +130,19 @@ class UI:
         indicator_pos = center_x + normalized_diff
         
         # Draw indicator
-        pygame.draw.circle(screen, YELLOW, (int(indicator_pos), indicator_y + indicator_height // 2), 10)
+        rects.append(pygame.draw.circle(screen, YELLOW, (int(indicator_pos), indicator_y + indicator_height // 2), 10))
         
         # Draw alignment text
         alignment_text = "Alignment"
         alignment_surface = self.font_small.render(alignment_text, True, WHITE)
-        screen.blit(alignment_surface, (indicator_x, indicator_y - 25))
+        rects.append(screen.blit(alignment_surface, (indicator_x, indicator_y - 25)))
+        return rects
     
-    def draw_game_over(self, screen, success):
+    def draw_game_over(self, screen, success, show_replay=True):
         # Create semi-transparent overlay
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 128))  # Black with alpha
-        screen.blit(overlay, (0, 0))
+        rects = [screen.blit(overlay, (0, 0))]
         
         # Draw game over message
         if success:
@@ -136,20 +154,28 @@ class UI:
             
         text_surface = self.font_large.render(message, True, color)
         text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
-        screen.blit(text_surface, text_rect)
+        rects.append(screen.blit(text_surface, text_rect))
         
         # Draw restart instructions
         restart_text = "Press SPACE to Restart or ESC to Quit"
         restart_surface = self.font_medium.render(restart_text, True, WHITE)
         restart_rect = restart_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
-        screen.blit(restart_surface, restart_rect)
-        
+        rects.append(screen.blit(restart_surface, restart_rect))
+        
+        # Draw replay instructions (only when there is a rewind buffer)
+        if show_replay:
+            replay_text = "R to Rewind, H to Save Highlight"
+            replay_surface = self.font_small.render(replay_text, True, WHITE)
+            replay_rect = replay_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 85))
+            rects.append(screen.blit(replay_surface, replay_rect))
+        return rects
+    
     def draw_menu(self, screen):
         # Draw title
         title_text = "ROCKET TO ISS"
         title_surface = self.font_large.render(title_text, True, WHITE)
         title_rect = title_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
-        screen.blit(title_surface, title_rect)
+        rects = [screen.blit(title_surface, title_rect)]
         
         # Draw instructions
         instructions = [
@@ -159,6 +185,9 @@ class UI:
             "UP Arrow: Apply Thrust",
             "LEFT/RIGHT Arrow: Rotate Rocket",
             "SPACE: Fine-tuned RCS Thrusters",
+            "R: Rewind (LEFT/RIGHT to scrub)",
+            "T: Toggle Predicted Path",
+            "< / >: Time Warp (while coasting)",
             "ESC: Quit Game",
             "",
             "Press SPACE to Begin Mission"
@@ -168,11 +197,34 @@ class UI:
         for line in instructions:
             text_surface = self.font_medium.render(line, True, WHITE)
             text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, y_pos))
-            screen.blit(text_surface, text_rect)
+            rects.append(screen.blit(text_surface, text_rect))
             y_pos += 30
+        return rects
     
     def draw_warning(self, screen, message):
         # Draw warning message at the center of the screen
         text_surface = self.font_medium.render(message, True, RED)
         text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-        screen.blit(text_surface, text_rect)
\ No newline at end of file
+        return [screen.blit(text_surface, text_rect)]
+    
+    def draw_rewind_bar(self, screen, position, length):
+        # Draw a timeline of the rewind buffer with the cursor position
+        bar_width = 400
+        bar_height = 12
+        bar_x = SCREEN_WIDTH // 2 - bar_width // 2
+        bar_y = SCREEN_HEIGHT - 100
+        
+        rects = [pygame.draw.rect(screen, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)]
+        
+        # Fill up to the cursor
+        fraction = (position + 1) / length if length > 0 else 0
+        filled_width = int(bar_width * fraction)
+        rects.append(pygame.draw.rect(screen, YELLOW, (bar_x, bar_y, filled_width, bar_height)))
+        
+        # Draw time offset from the latest recorded tick
+        seconds_back = (length - 1 - position) / FPS
+        rewind_text = f"REWIND -{seconds_back:.1f}s  (LEFT/RIGHT: scrub, R/SPACE: resume)"
+        rewind_surface = self.font_small.render(rewind_text, True, YELLOW)
+        rewind_rect = rewind_surface.get_rect(center=(SCREEN_WIDTH//2, bar_y - 15))
+        rects.append(screen.blit(rewind_surface, rewind_rect))
+        return rects
\ No newline at end of file
@@ -2,13 +2,18 @@ import pygame
 import os
 import random
 
+def convert_image(image, use_alpha=True):
+    """Convert an image for fast blitting, if there is a display to convert for."""
+    if pygame.display.get_surface() is None:
+        return image
+    if use_alpha:
+        return image.convert_alpha()
+    return image.convert()
+
 def load_image(filename, use_alpha=True):
     """Load an image from the assets folder with transparency."""
     try:
-        if use_alpha:
-            return pygame.image.load(filename).convert_alpha()
-        else:
-            return pygame.image.load(filename).convert()
+        return convert_image(pygame.image.load(filename), use_alpha)
     except pygame.error as e:
         print(f"Unable to load image: {filename}")
         print(e)
@@ -23,17 +28,22 @@ def load_sound(filename):
         print(e)
         return None
 
-def create_stars_background(width, height, num_stars=100):
-    """Create a starry background surface."""
+def create_stars_background(width, height, num_stars=100, seed=None):
+    """
+    Create a starry background surface.
+    
+    With the same seed, a smaller num_stars gives a subset of the same stars.
+    """
+    rng = random.Random(seed)
     bg = pygame.Surface((width, height))
     bg.fill((0, 0, 20))  # Dark blue background
     
     # Add random stars
     for _ in range(num_stars):
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        brightness = random.randint(128, 255)
-        size = random.randint(1, 3)
+        x = rng.randint(0, width - 1)
+        y = rng.randint(0, height - 1)
+        brightness = rng.randint(128, 255)
+        size = rng.randint(1, 3)
         pygame.draw.circle(bg, (brightness, brightness, brightness), (x, y), size)
     
     return bg